@@ -0,0 +1,241 @@
+"""A small in-memory Canvas API server for the benchmark scripts.
+
+It serves just enough of the Canvas REST API for the package's fetchers:
+courses, assignments (paged, with a Link header), assignment groups, users,
+submissions (with graded_since / submitted_since / assignment_ids[] filters)
+and the activity stream. Responses are gzip or brotli compressed when the
+client's Accept-Encoding asks for it (brotli needs the ``brotli`` package).
+"""
+
+import gzip
+import json
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# A moderate level, like a web server compressing on the fly; the maximum
+# (11) costs far more CPU per response than a real server would spend
+BROTLI_QUALITY = 5
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class MockCanvas:
+    def __init__(
+        self,
+        n_courses: int = 10,
+        n_assignments: int = 50,
+        n_users: int = 30,
+        description_size: int = 2000,
+        first_course_id: int = 1000,
+    ):
+        self.lock = threading.Lock()
+        self.course_ids = list(range(first_course_id, first_course_id + n_courses))
+        self.assignments = {}
+        self.submissions = {}
+        self.users = {}
+        self.activity = []
+        self.fail_courses = set()
+        self._next_id = 1
+        start = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+        for course_id in self.course_ids:
+            self.assignments[course_id] = []
+            for i in range(n_assignments):
+                due = start + timedelta(days=i)
+                self._add(course_id, f"Assignment {i}", due, description_size)
+            self.users[course_id] = [
+                {
+                    "id": 500000 + u,
+                    "name": f"Student {u}",
+                    "created_at": "2020-01-01T00:00:00-07:00",
+                    "enrollments": [{"type": "StudentEnrollment"}],
+                }
+                for u in range(n_users)
+            ]
+
+    def _add(self, course_id, name, due, description_size):
+        assignment_id = self._next_id
+        self._next_id += 1
+        self.assignments[course_id].append(
+            {
+                "id": assignment_id,
+                "workflow_state": "published",
+                "course_id": course_id,
+                "name": name,
+                "description": "<p>Read the chapter.</p>" * (description_size // 24),
+                "position": len(self.assignments[course_id]) + 1,
+                "points_possible": 10,
+                "grading_type": "points",
+                "created_at": "2026-01-01T00:00:00Z",
+                "due_at": due.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "omit_from_final_grade": False,
+                "assignment_group_id": 7,
+            }
+        )
+        self.submissions[(course_id, assignment_id)] = {
+            "assignment_id": assignment_id,
+            "score": None,
+            "grade": None,
+            "submission_type": None,
+            "submitted_at": None,
+            "graded_at": None,
+            "excused": False,
+            "attempt": None,
+            "late": False,
+            "missing": False,
+        }
+        return assignment_id
+
+    # --- mutations used by the benchmarks ----------------------------------
+
+    def grade(self, course_id: int, index: int, score: float):
+        with self.lock:
+            assignment = self.assignments[course_id][index]
+            submission = self.submissions[(course_id, assignment["id"])]
+            submission["score"] = score
+            submission["grade"] = str(score)
+            submission["graded_at"] = now_iso()
+
+    def add_assignment(self, course_id: int, name: str):
+        with self.lock:
+            due = datetime.now(timezone.utc) + timedelta(days=7)
+            assignment_id = self._add(course_id, name, due, 200)
+            self.activity.insert(
+                0,
+                {
+                    "type": "Message",
+                    "notification_category": "Due Date",
+                    "course_id": course_id,
+                    "updated_at": now_iso(),
+                },
+            )
+            return assignment_id
+
+    # --- request handling --------------------------------------------------
+
+    def route(self, path: str, query: dict):
+        """Return (status, JSON-able body) for a GET request."""
+        if path == "/api/v1/users/self":
+            return 200, {"id": 1, "name": "Benchmark User"}
+        if path == "/api/v1/users/self/activity_stream":
+            return 200, list(self.activity)
+        if path == "/api/v1/courses":
+            return 200, [
+                {
+                    "id": course_id,
+                    "name": f"Course {course_id}",
+                    "course_code": f"BENCH {course_id}",
+                    "term": {
+                        "id": 1,
+                        "name": "Winter 2026",
+                        "start_at": "2026-01-01T00:00:00Z",
+                        "end_at": "2026-04-30T00:00:00Z",
+                    },
+                    "enrollments": [{"type": "student"}],
+                }
+                for course_id in self.course_ids
+            ]
+
+        match = re.fullmatch(r"/api/v1/courses/(\d+)/(.+)", path)
+        if not match:
+            return 404, {"errors": [{"message": "not found"}]}
+        course_id, resource = int(match.group(1)), match.group(2)
+        if course_id not in self.assignments:
+            return 404, {"errors": [{"message": "not found"}]}
+        if course_id in self.fail_courses:
+            return 500, {"errors": [{"message": "temporary failure"}]}
+
+        if resource == "assignments":
+            return 200, [
+                {**a, "submission": self.submissions[(course_id, a["id"])]}
+                for a in self.assignments[course_id]
+            ]
+        if resource == "assignment_groups":
+            return 200, [
+                {"id": 7, "name": "Homework", "group_weight": 40, "position": 1}
+            ]
+        if resource == "users":
+            return 200, self.users[course_id]
+        if resource == "students/submissions":
+            rows = [s for (c, _), s in self.submissions.items() if c == course_id]
+            if "graded_since" in query:
+                since = query["graded_since"][0]
+                rows = [s for s in rows if s["graded_at"] and s["graded_at"] >= since]
+            if "submitted_since" in query:
+                since = query["submitted_since"][0]
+                rows = [
+                    s for s in rows if s["submitted_at"] and s["submitted_at"] >= since
+                ]
+            if "assignment_ids[]" in query:
+                wanted = {int(i) for i in query["assignment_ids[]"]}
+                rows = [s for s in rows if s["assignment_id"] in wanted]
+            return 200, rows
+        return 404, {"errors": [{"message": "not found"}]}
+
+
+def _handler(canvas: MockCanvas):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            with canvas.lock:
+                status, body = canvas.route(url.path, query)
+
+            headers = {"Content-Type": "application/json"}
+            if isinstance(body, list):
+                per_page = int(query.get("per_page", ["10"])[0])
+                page = int(query.get("page", ["1"])[0])
+                if len(body) > page * per_page:
+                    query["page"] = [str(page + 1)]
+                    query["per_page"] = [str(per_page)]
+                    params = "&".join(f"{k}={v}" for k in query for v in query[k])
+                    next_url = f"http://{self.headers['Host']}{url.path}?{params}"
+                    headers["Link"] = f'<{next_url}>; rel="next"'
+                body = body[(page - 1) * per_page : page * per_page]
+
+            payload = self.encode(json.dumps(body).encode(), headers)
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def encode(self, payload: bytes, headers: dict) -> bytes:
+            """Compress the body the way the client asked, if we can."""
+            accepted = {
+                e.split(";")[0].strip()
+                for e in self.headers.get("Accept-Encoding", "").split(",")
+            }
+            if "br" in accepted and brotli is not None:
+                headers["Content-Encoding"] = "br"
+                return brotli.compress(payload, quality=BROTLI_QUALITY)
+            if "gzip" in accepted:
+                headers["Content-Encoding"] = "gzip"
+                return gzip.compress(payload, compresslevel=6)
+            return payload
+
+    return Handler
+
+
+def serve(canvas: MockCanvas):
+    """Start the mock server on a free local port and return (server, base URL)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(canvas))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
@@ -0,0 +1,84 @@
+"""Single-stage vs two-stage (process-pool parsing) multi-course fetches.
+
+Serves a large mock Canvas from a separate process, so the server doesn't
+compete for the client's GIL, and times get_assignments_all_courses() with
+and without a reused parse pool for several I/O thread counts. The pool is
+warmed up before timing, so worker start-up is not counted. Run it on the
+machine you care about; the speed-up depends on the number of cores.
+
+    python benchmarks/parse_pipeline.py --courses 200 --parse-workers 8
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+
+import polars as pl
+
+from canvasconnector import (
+    CanvasClient,
+    create_parse_pool,
+    get_assignments_all_courses,
+)
+from mock_canvas import MockCanvas, serve
+
+
+def run_server(n_courses, n_assignments, queue):
+    canvas = MockCanvas(n_courses=n_courses, n_assignments=n_assignments)
+    server, url = serve(canvas)
+    queue.put((url, canvas.course_ids))
+    server.serve_forever()
+
+
+def timed(client, course_ids, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = get_assignments_all_courses(client, course_ids, **kwargs)
+    return time.perf_counter() - start, len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--courses", type=int, default=100)
+    parser.add_argument("--assignments", type=int, default=300)
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--threads", type=int, nargs="+", default=[2, 4, 8, 16])
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    server = context.Process(
+        target=run_server,
+        args=(args.courses, args.assignments, queue),
+        daemon=True,
+    )
+    server.start()
+    url, ids = queue.get()
+    course_ids = pl.Series(ids)
+    client = CanvasClient("token", url, verify_connection=False)
+
+    print(
+        f"cpus={os.cpu_count()} courses={args.courses} "
+        f"assignments/course={args.assignments} parse_workers={args.parse_workers}"
+    )
+    print(f"{'threads':>7} {'single-stage s':>14} {'two-stage s':>11} {'rows':>8}")
+
+    with create_parse_pool(args.parse_workers) as pool:
+        # Start the workers (and their Polars import) before timing anything
+        timed(client, course_ids[:1], parse_executor=pool)
+
+        for threads in args.threads:
+            single, rows = timed(client, course_ids, max_workers=threads)
+            double, _ = timed(
+                client, course_ids, max_workers=threads, parse_executor=pool
+            )
+            print(f"{threads:>7} {single:>14.2f} {double:>11.2f} {rows:>8}")
+
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Memory of the typed frames vs the same data as plain Utf8/Int64 columns.
+
+Fetches courses, assignments and peers from the local mock server, then
+compares estimated_size() of each frame as returned (apply_schema() output)
+with a copy where every Enum/Categorical column is cast back to Utf8 and every
+Int32 column back to Int64, which is what the frames held before the schemas.
+
+    python benchmarks/schema_memory.py --courses 200
+"""
+
+import argparse
+import contextlib
+import io
+
+import polars as pl
+
+from canvasconnector import (
+    CanvasClient,
+    get_all_peers,
+    get_assignments_all_courses,
+    get_courses_polars,
+)
+from mock_canvas import MockCanvas, serve
+
+
+def plain(df: pl.DataFrame) -> pl.DataFrame:
+    """Undo the compact dtypes: text columns as Utf8, integers as Int64."""
+    casts = {}
+    for column, dtype in df.schema.items():
+        if isinstance(dtype, (pl.Enum, pl.Categorical)):
+            casts[column] = pl.Utf8
+        elif dtype == pl.Int32:
+            casts[column] = pl.Int64
+    return df.cast(casts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--assignments", type=int, default=300)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    canvas = MockCanvas(
+        n_courses=args.courses, n_assignments=args.assignments, n_users=args.users
+    )
+    server, url = serve(canvas)
+    client = CanvasClient("token", url, verify_connection=False)
+
+    # get_courses_polars() reads a single page of courses, so fetch the
+    # other frames for every mock course directly
+    course_ids = pl.Series(canvas.course_ids)
+    with contextlib.redirect_stdout(io.StringIO()):
+        frames = {
+            "courses": get_courses_polars(client, current_only=False),
+            "assignments": get_assignments_all_courses(
+                client, course_ids, max_workers=8
+            ),
+            "peers": get_all_peers(client, course_ids, max_workers=8),
+        }
+    server.shutdown()
+
+    print(f"courses={args.courses} assignments/course={args.assignments}")
+    print(f"{'frame':>11} {'rows':>8} {'plain KB':>9} {'typed KB':>9} {'saved':>6}")
+    for name, df in frames.items():
+        before = plain(df).estimated_size("kb")
+        after = df.estimated_size("kb")
+        print(
+            f"{name:>11} {len(df):>8} {before:>9.1f} {after:>9.1f} "
+            f"{1 - after / before:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
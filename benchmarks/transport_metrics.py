@@ -0,0 +1,71 @@
+"""Byte counts and latency of the 'requests' and 'httpx' transports.
+
+Fetches the same assignment pages from the local mock Canvas server with
+each transport and Accept-Encoding setting, using CanvasClient.metrics for
+the numbers. ``wire KB`` is what crossed the network (compressed), ``decoded
+KB`` what the fetchers parsed.
+
+httpx only negotiates HTTP/2 over TLS, so against this plain-HTTP server both
+transports use HTTP/1.1 (the ``http`` column shows what was used); the
+multiplexing gain needs an HTTPS Canvas instance to measure.
+
+    python benchmarks/transport_metrics.py --requests 200 --threads 8
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from canvasconnector import CanvasClient
+from mock_canvas import MockCanvas, serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    canvas = MockCanvas(n_courses=20, n_assignments=100)
+    server, url = serve(canvas)
+    urls = [
+        f"{url}/api/v1/courses/{canvas.course_ids[i % 20]}/assignments"
+        for i in range(args.requests)
+    ]
+
+    print(
+        f"{'transport':>9} {'encoding':>17} {'http':>8} {'requests':>8} "
+        f"{'wire KB':>9} {'decoded KB':>10} {'ms/req':>7} {'wall s':>6}"
+    )
+    for transport in ["requests", "httpx"]:
+        for encoding in ["identity", "gzip, deflate", "br, gzip, deflate"]:
+            client = CanvasClient(
+                "token", url, verify_connection=False, transport=transport
+            )
+            client.headers["Accept-Encoding"] = encoding
+            http = getattr(client.get(urls[0]), "http_version", "HTTP/1.1")
+            client.reset_metrics()
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as executor:
+                list(
+                    executor.map(
+                        lambda u: client.get(u, params={"per_page": 100}).json(),
+                        urls,
+                    )
+                )
+            wall = time.perf_counter() - start
+
+            m = client.metrics
+            print(
+                f"{transport:>9} {encoding:>17} {http:>8} {m['requests']:>8} "
+                f"{m['bytes'] / 1024:>9.1f} {m['decoded_bytes'] / 1024:>10.1f} "
+                f"{m['seconds'] / m['requests'] * 1000:>7.1f} {wall:>6.2f}"
+            )
+            client.close()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Per-poll cost of watch_assignments() against the local mock server.
+
+For each course count, a baseline poll is taken, then ``changes`` scores are
+posted and one more poll is measured. The incremental poll is compared with a
+poll that refetches every course (full_refresh_every=1).
+
+    python benchmarks/watch_poll.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import polars as pl
+
+from canvasconnector import CanvasClient, watch_assignments
+from mock_canvas import MockCanvas, serve
+
+
+def measured_poll(client, course_ids, state_path, **kwargs):
+    client.reset_metrics()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        events = list(
+            watch_assignments(
+                client,
+                course_ids,
+                interval=0,
+                state_path=state_path,
+                max_polls=1,
+                **kwargs,
+            )
+        )
+    elapsed = time.perf_counter() - start
+    n_events = sum(len(e) for e in events)
+    return client.metrics, elapsed, n_events
+
+
+def main():
+    print(
+        f"{'courses':>7} {'changes':>7} {'mode':>11} {'events':>6} "
+        f"{'requests':>8} {'wire KB':>9} {'decoded KB':>10} {'seconds':>7}"
+    )
+    for n_courses in [10, 50, 200]:
+        for changes in [0, 10, 100]:
+            canvas = MockCanvas(n_courses=n_courses, n_assignments=50)
+            server, url = serve(canvas)
+            client = CanvasClient("token", url, verify_connection=False)
+            course_ids = pl.Series(canvas.course_ids)
+            state_path = os.path.join(tempfile.mkdtemp(), "state.parquet")
+
+            for offset, (mode, kwargs) in enumerate(
+                [
+                    ("incremental", {"full_refresh_every": None}),
+                    ("full", {"full_refresh_every": 1}),
+                ]
+            ):
+                if os.path.exists(state_path):
+                    os.remove(state_path)
+                measured_poll(client, course_ids, state_path, **kwargs)
+
+                for i in range(changes):
+                    course_id = canvas.course_ids[i % n_courses]
+                    canvas.grade(course_id, i // n_courses, 1000 * offset + i)
+
+                metrics, elapsed, n_events = measured_poll(
+                    client, course_ids, state_path, **kwargs
+                )
+                print(
+                    f"{n_courses:>7} {changes:>7} {mode:>11} {n_events:>6} "
+                    f"{metrics['requests']:>8} {metrics['bytes'] / 1024:>9.1f} "
+                    f"{metrics['decoded_bytes'] / 1024:>10.1f} "
+                    f"{elapsed:>7.2f}"
+                )
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
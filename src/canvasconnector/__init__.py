@@ -16,6 +16,8 @@ from .get_assignments import (
 from .get_peers import get_peers, get_all_peers
 from .get_best_friends import get_best_friends
 from .get_upcoming_assignments import get_upcoming_assignments
+from .watch_assignments import diff_assignments, watch_assignments
+from .utils import create_parse_pool
 
 
 __all__ = [
@@ -29,4 +31,7 @@ __all__ = [
     "get_all_peers",
     "get_best_friends",
     "get_upcoming_assignments",
+    "diff_assignments",
+    "watch_assignments",
+    "create_parse_pool",
 ]
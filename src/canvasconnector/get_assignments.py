@@ -1,15 +1,41 @@
 from .make_client import CanvasClient
-from .utils import convert_canvas_datetime
-
-import requests
+from .schemas import ASSIGNMENT_GROUPS_SCHEMA, apply_schema, assignments_schema
+from .utils import (
+    clear_course_partitions,
+    convert_canvas_datetime,
+    iter_parsed_results,
+    write_course_partition,
+)
+
+import json
+from concurrent.futures import Executor
+from functools import partial
 import polars as pl
 from typing import Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 def get_assignments(
     client: CanvasClient, course_code: int, assignment_weights: bool = False
 ):
+    raw = _fetch_assignments_raw(client, course_code, assignment_weights)
+    return _parse_assignments(course_code, raw, client.timezone)
+
+
+def get_assignment_group(client: CanvasClient, course_code: int):
+    return _parse_assignment_groups(_fetch_assignment_groups_raw(client, course_code))
+
+
+def _fetch_assignments_raw(
+    client: CanvasClient, course_code: int, assignment_weights: bool = False
+) -> tuple[list[bytes], Optional[bytes]]:
+    """Download the raw JSON pages for a course's assignments.
+
+    Only network I/O happens here so this can run on an I/O thread while the
+    parsing happens elsewhere (see _parse_assignments).
+
+    Returns:
+        tuple: (list of assignment page bodies, assignment groups body or None)
+    """
     url: Optional[str] = f"{client.canvas_url}/api/v1/courses/{course_code}/assignments"
 
     params: Optional[dict[str, int | str]] = {
@@ -17,11 +43,11 @@ def get_assignments(
         "include[]": "submission",
     }
 
-    all_assignments = []
+    pages = []
 
     while url:
-        response = requests.get(url, headers=client.headers, params=params)
-        all_assignments.extend(response.json())
+        response = client.get(url, params=params)
+        pages.append(response.content)
 
         # Check for next page
         url = None
@@ -33,6 +59,28 @@ def get_assignments(
                     url = link[link.find("<") + 1 : link.find(">")]
                     break
 
+    groups = None
+    if assignment_weights:
+        groups = _fetch_assignment_groups_raw(client, course_code)
+
+    return pages, groups
+
+
+def _parse_assignments(
+    course_code: int, raw: tuple[list[bytes], Optional[bytes]], timezone: str
+) -> pl.DataFrame:
+    """Turn the output of _fetch_assignments_raw into a typed DataFrame.
+
+    This is a top-level function of plain arguments so it can run in a
+    process pool.
+    """
+    pages, groups = raw
+    assignment_weights = groups is not None
+
+    all_assignments = []
+    for page in pages:
+        all_assignments.extend(json.loads(page))
+
     # Handle empty assignments
     if not all_assignments:
         return pl.DataFrame()
@@ -108,7 +156,7 @@ def get_assignments(
     # )
 
     if assignment_weights:
-        weights = get_assignment_group(client, course_code)
+        weights = _parse_assignment_groups(groups)
         clean_df = clean_df.join(weights, how="left", on="assignment_group_id")
 
     # Convert datetime columns
@@ -120,18 +168,22 @@ def get_assignments(
                 pl.col(col)
                 .str.strptime(pl.Datetime, format="%Y-%m-%dT%H:%M:%SZ", strict=False)
                 .dt.replace_time_zone("UTC")
-                .dt.convert_time_zone(client.timezone)
+                .dt.convert_time_zone(timezone)
                 .alias(col)
             )
 
-    return clean_df
+    return apply_schema(clean_df, assignments_schema(timezone, assignment_weights))
 
 
-def get_assignment_group(client: CanvasClient, course_code: int):
+def _fetch_assignment_groups_raw(client: CanvasClient, course_code: int) -> bytes:
     url = f"{client.canvas_url}/api/v1/courses/{course_code}/assignment_groups"
 
-    response = requests.get(url, headers=client.headers)
-    groups = response.json()
+    response = client.get(url)
+    return response.content
+
+
+def _parse_assignment_groups(content: bytes) -> pl.DataFrame:
+    groups = json.loads(content)
 
     # Convert to DataFrame
     groups_df = pl.DataFrame(groups)
@@ -150,7 +202,7 @@ def get_assignment_group(client: CanvasClient, course_code: int):
         ]
     )
 
-    return groups_clean
+    return apply_schema(groups_clean, ASSIGNMENT_GROUPS_SCHEMA)
 
 
 # def get_assignments_all_courses(client: CanvasClient, course_list: pl.Series):
@@ -181,33 +233,96 @@ def get_assignment_group(client: CanvasClient, course_code: int):
 
 
 def get_assignments_all_courses(
-    client: CanvasClient, course_list: pl.Series, max_workers: int = 5
+    client: CanvasClient,
+    course_list: pl.Series,
+    max_workers: int = 5,
+    sink: Optional[str] = None,
+    return_frame: bool = True,
+    max_in_flight: Optional[int] = None,
+    parse_workers: Optional[int] = None,
+    parse_executor: Optional[Executor] = None,
 ):
-    """Get assignments for all courses in parallel."""
+    """Get assignments for all courses in parallel.
+
+        Args:
+            client (CanvasClient): The Canvas API client instance.
+            course_list (pl.Series): Course IDs to fetch assignments for.
+            max_workers (int): Number of concurrent course fetches (default: 5).
+            sink (str, optional): Directory to stream results into. Each course is
+                written to its own ``assignments_<course_id>.parquet`` file as soon
+                as it is ready, so results reach disk without waiting for the other
+                courses. Courses with no assignments are skipped. Assignment files
+                left by an earlier run are deleted first, so the sink only holds
+                this run's courses; other files in it are left alone.
+            return_frame (bool): If False, don't keep course results in memory and
+                return an empty DataFrame. Requires ``sink``.
+            max_in_flight (int, optional): Maximum number of course results held
+                in memory at once (default: 2 * max_workers).
+            parse_workers (int, optional): Number of processes used to decode
+                the JSON and build the frames. If None (default), the fetching
+                threads also do the parsing. Setting this helps when many
+                workers are fetching at once and parsing becomes the bottleneck.
+                The pool only lives for this call; see ``parse_executor``. The
+                workers are started with "spawn", so a script that sets this
+                must keep its top-level code under ``if __name__ == "__main__":``.
+            parse_executor (Executor, optional): Existing process pool to parse
+                in, from create_parse_pool(). Reusing one pool across calls
+                avoids starting new worker processes every time.
+
+        Returns:
+            pl.DataFrame: Combined assignments from all courses (empty if
+                ``return_frame`` is False).
+
+        Raises:
+            ValueError: If ``return_frame`` is False and no ``sink`` is given.
+
+        Example:
+    ```python
+            get_assignments_all_courses(
+                client, courses["course_id"], sink="assignments/", return_frame=False
+            )
+            assignments = pl.scan_parquet("assignments/assignments_*.parquet")
+    ```
+    """
+
+    if sink is None and not return_frame:
+        raise ValueError(
+            "return_frame=False needs a sink, otherwise every result is discarded."
+        )
+
+    if sink is not None:
+        clear_course_partitions(sink, "assignments")
 
     all_courses_assignments = []
 
-    # Use ThreadPoolExecutor to fetch in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        futures = {
-            executor.submit(get_assignments, client, course_id, True): course_id
-            for course_id in course_list
-        }
-
-        # Collect results as they complete
-        for future in as_completed(futures):
-            course_id = futures[future]
-            try:
-                print(f"Fetching assignments for course {course_id}...")
-                result = future.result()
-                if len(result) > 0:
+    def fetch(course_id):
+        return _fetch_assignments_raw(client, course_id, True)
+
+    parse = partial(_parse_assignments, timezone=client.timezone)
+
+    # Collect results as they complete
+    for course_id, future in iter_parsed_results(
+        fetch,
+        parse,
+        course_list,
+        max_workers,
+        parse_workers,
+        max_in_flight,
+        parse_executor,
+    ):
+        try:
+            print(f"Fetching assignments for course {course_id}...")
+            result = future.result()
+            if len(result) > 0:
+                if sink is not None:
+                    write_course_partition(result, sink, "assignments", course_id)
+                if return_frame:
                     all_courses_assignments.append(result)
-            except Exception as e:
-                print(f"Error fetching course {course_id}: {e}")
+        except Exception as e:
+            print(f"Error fetching course {course_id}: {e}")
 
     # Concatenate all course assignments
     if not all_courses_assignments:
         return pl.DataFrame()
 
-    return pl.concat(all_courses_assignments, how="diagonal")
+    return pl.concat(all_courses_assignments)
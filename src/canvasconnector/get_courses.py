@@ -1,7 +1,7 @@
 from .make_client import CanvasClient
-import requests
 from datetime import datetime
 import polars as pl
+from .schemas import COURSES_SCHEMA, apply_schema
 
 
 def get_courses_raw(client: CanvasClient):
@@ -35,9 +35,8 @@ def get_courses_raw(client: CanvasClient):
     ```
     """
 
-    response = requests.get(
+    response = client.get(
         f"{client.canvas_url}/api/v1/courses",
-        headers=client.headers,
         params=[("per_page", 100), ("include[]", "term")],
     )
 
@@ -112,6 +111,7 @@ def get_courses_polars(client: CanvasClient, current_only: bool):
             pl.col("term_end_at").str.strptime(pl.Date, "%Y-%m-%dT%H:%M:%SZ"),
         ]
     )
+    df = apply_schema(df, COURSES_SCHEMA)
 
     if current_only:
         today = pl.lit(datetime.now().date())
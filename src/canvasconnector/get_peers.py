@@ -1,7 +1,10 @@
 from .make_client import CanvasClient
-import requests
+import json
 import polars as pl
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from .schemas import PEERS_SCHEMA, apply_schema
+from .utils import clear_course_partitions, iter_parsed_results, write_course_partition
+from typing import Optional
+from concurrent.futures import Executor
 
 def get_peers(client: CanvasClient, course_code: int):
     """
@@ -46,6 +49,14 @@ def get_peers(client: CanvasClient, course_code: int):
         - The function automatically handles API pagination to retrieve all users.
         - You can typically only retrieve users from courses you're enrolled in.
     """
+    return _parse_peers(course_code, _fetch_peers_raw(client, course_code))
+
+def _fetch_peers_raw(client: CanvasClient, course_code: int):
+    """
+    Download the raw JSON pages of a course's users (network I/O only).
+    
+    Raises the same errors as get_peers().
+    """
     url = f"{client.canvas_url}/api/v1/courses/{course_code}/users"  # Changed to /users
     
     params = {
@@ -53,16 +64,15 @@ def get_peers(client: CanvasClient, course_code: int):
         'include[]': 'enrollments',
     }
     
-    all_users = []
+    pages = []
     
     # Pagination loop
     # Pagination loop
     while url:
-        response = requests.get(url, headers=client.headers, params=params)
+        response = client.get(url, params=params)
         
         if response.status_code == 200:
-            users = response.json()
-            all_users.extend(users)
+            pages.append(response.content)
             
             # Check for next page
             if 'next' in response.links:
@@ -76,6 +86,18 @@ def get_peers(client: CanvasClient, course_code: int):
             raise ValueError(f"Course {course_code} not found.")
         else:
             raise Exception(f"API request failed with status {response.status_code}: {response.text}")
+
+    return pages
+
+def _parse_peers(course_code: int, pages: list):
+    """
+    Turn the pages from _fetch_peers_raw() into the get_peers() DataFrame.
+    
+    Kept as a top-level function so it can run in a process pool.
+    """
+    all_users = []
+    for page in pages:
+        all_users.extend(json.loads(page))
     
     # Prepare data for DataFrame
     data = []
@@ -97,16 +119,18 @@ def get_peers(client: CanvasClient, course_code: int):
             })
     
     # Create Polars DataFrame
-    df = pl.DataFrame(data)
+    df = pl.DataFrame(data, schema={**PEERS_SCHEMA, 'user_date': pl.Utf8, 'user_type': pl.Utf8})
     
     # Convert user_date to date only
     df = df.with_columns([
         pl.col('user_date').str.strptime(pl.Date, "%Y-%m-%dT%H:%M:%S%z")
     ]).unique(subset=['user_id'])  
     
-    return df  
+    return apply_schema(df, PEERS_SCHEMA)
 
-def get_all_peers(client: CanvasClient, course_list: pl.Series, max_workers: int = 2, unique_per_course: bool = True):
+def get_all_peers(client: CanvasClient, course_list: pl.Series, max_workers: int = 2, unique_per_course: bool = True,
+                  sink: Optional[str] = None, return_frame: bool = True, max_in_flight: Optional[int] = None,
+                  parse_workers: Optional[int] = None, parse_executor: Optional[Executor] = None):
     """
     Get peers from multiple courses concurrently.
     
@@ -116,33 +140,57 @@ def get_all_peers(client: CanvasClient, course_list: pl.Series, max_workers: int
         max_workers: Maximum number of concurrent threads (default: 2)
         unique_per_course: If True (default), each user appears once per course they're in.
                           If False, each user appears only once total.
+        sink: Optional directory to stream results into. Each course is written to its
+              own peers_<course_id>.parquet file as soon as it is ready (courses with no
+              users are skipped). Peer files left by an earlier run are deleted first;
+              other files in the directory are left alone. Files always hold one row per
+              user per course; unique_per_course=False only applies to the returned frame.
+        return_frame: If False, course results are not kept in memory and an empty
+                      DataFrame is returned. Requires sink.
+        max_in_flight: Maximum number of course results held in memory at once
+                       (default: 2 * max_workers)
+        parse_workers: Number of processes used to decode the JSON and build the frames.
+                       If None (default), the fetching threads also do the parsing.
+                       The pool only lives for this call; see parse_executor. The workers
+                       are started with "spawn", so a script that sets this must keep its
+                       top-level code under if __name__ == "__main__":.
+        parse_executor: Existing process pool to parse in, from create_parse_pool().
+                        Reusing one pool across calls avoids starting new workers each time.
     
     Returns:
         pl.DataFrame: Combined DataFrame of all peers from all courses
+    
+    Raises:
+        ValueError: If return_frame is False and no sink is given.
     """
+    if sink is None and not return_frame:
+        raise ValueError("return_frame=False needs a sink, otherwise every result is discarded.")
+    
+    if sink is not None:
+        clear_course_partitions(sink, "peers")
+    
     all_dfs = []
     failed_courses = []
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_course = {
-            executor.submit(get_peers, client, course_id): course_id 
-            for course_id in course_list
-        }
-        
-        # Process completed tasks
-        for future in as_completed(future_to_course):
-            course_id = future_to_course[future]
-            try:
-                df = future.result()
-                all_dfs.append(df)
-                print(f"Successfully retrieved peers from course {course_id}")
-            except PermissionError as e:
-                print(f"Skipping course {course_id}: {e}")
-                failed_courses.append(course_id)
-            except Exception as e:
-                print(f"Error with course {course_id}: {e}")
-                failed_courses.append(course_id)
+    # Process completed tasks
+    for course_id, future in iter_parsed_results(
+        lambda course_id: _fetch_peers_raw(client, course_id), _parse_peers,
+        course_list, max_workers, parse_workers, max_in_flight, parse_executor
+    ):
+        try:
+            df = future.result()
+            if len(df) > 0:
+                if sink is not None:
+                    write_course_partition(df, sink, "peers", course_id)
+                if return_frame:
+                    all_dfs.append(df)
+            print(f"Successfully retrieved peers from course {course_id}")
+        except PermissionError as e:
+            print(f"Skipping course {course_id}: {e}")
+            failed_courses.append(course_id)
+        except Exception as e:
+            print(f"Error with course {course_id}: {e}")
+            failed_courses.append(course_id)
     
     # Combine all DataFrames
     if all_dfs:
@@ -162,7 +210,10 @@ def get_all_peers(client: CanvasClient, course_list: pl.Series, max_workers: int
             print(f"Failed courses: {failed_courses}")
         return combined_df
     else:
-        print("No data retrieved from any courses")
+        if not return_frame and sink is not None:
+            print(f"Peers written to {sink}")
+        else:
+            print("No data retrieved from any courses")
         return pl.DataFrame()
 
     
@@ -1,5 +1,19 @@
+import threading
+import time
 import requests
 
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+
+        ACCEPT_ENCODING = "br, gzip, deflate"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
 
 class CanvasClient:
     def __init__(
@@ -8,6 +22,7 @@ class CanvasClient:
         canvas_url: str,
         timezone: str = "UTC",
         verify_connection: bool = True,
+        transport: str = "requests",
     ):
         """
         Initialize Canvas API client.
@@ -17,18 +32,114 @@ class CanvasClient:
             canvas_url: Your Canvas instance URL (e.g., 'https://canvas.instructure.com')
             timezone: IANA timezone string (e.g., 'America/Denver'). Default: 'UTC'
             verify_connection: If True, verify the connection on initialization (default: True)
+            transport: HTTP backend used by every fetcher. 'requests' (default) uses
+                HTTP/1.1 through requests. 'httpx' uses one shared HTTP/2 connection,
+                so concurrent page requests are multiplexed instead of each opening
+                its own connection. Requires the optional dependencies:
+                pip install "canvasconnector[http2]"
         """
         self.canvas_url = canvas_url.rstrip("/")
-        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Accept-Encoding": ACCEPT_ENCODING,
+        }
         self.timezone = timezone
         self.user_name = None
         self.user_id = None
+        self.transport = transport
+
+        # Totals across all requests; read with client.metrics
+        self._metrics = {"requests": 0, "bytes": 0, "decoded_bytes": 0, "seconds": 0.0}
+        self._metrics_lock = threading.Lock()
+
+        if transport == "requests":
+            self._session = None
+            self._network_errors = (requests.exceptions.RequestException,)
+        elif transport == "httpx":
+            # httpx.Client(http2=True) raises its own ImportError when h2 is
+            # missing, so it belongs inside the try as well
+            try:
+                import httpx
+
+                self._session = httpx.Client(
+                    http2=True, follow_redirects=True, timeout=30.0
+                )
+            except ImportError as e:
+                raise ImportError(
+                    "The 'httpx' transport needs extra dependencies. "
+                    'Install them with: pip install "canvasconnector[http2]"'
+                ) from e
+            self._network_errors = (httpx.HTTPError,)
+        else:
+            raise ValueError(
+                f"Unknown transport '{transport}'. Use 'requests' or 'httpx'."
+            )
 
         if verify_connection:
             self.test_connection()
 
     def __repr__(self):
-        return f"CanvasClient(url={self.canvas_url}, user={self.user_name}, user_id={self.user_id})"
+        return f"CanvasClient(url={self.canvas_url}, user={self.user_name}, user_id={self.user_id}, transport={self.transport})"
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Request totals for this client.
+
+        Returns:
+            dict: requests (count), bytes (received over the wire, before
+            decompression), decoded_bytes (after decompression) and seconds
+            (summed request latency).
+        """
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    def reset_metrics(self):
+        """Set all request metrics back to zero."""
+        with self._metrics_lock:
+            self._metrics = {
+                "requests": 0,
+                "bytes": 0,
+                "decoded_bytes": 0,
+                "seconds": 0.0,
+            }
+
+    def get(self, url: str, params=None):
+        """
+        Send a GET request to the Canvas API with the configured transport.
+
+        Args:
+            url: Full request URL
+            params: Optional query parameters (dict or list of tuples)
+
+        Returns:
+            The response object (requests.Response or httpx.Response). Both
+            provide status_code, headers, links, content, text and json().
+        """
+        start = time.perf_counter()
+        if self._session is None:
+            response = requests.get(url, headers=self.headers, params=params)
+            decoded = len(response.content)
+            raw = getattr(response, "raw", None)
+            wire = raw.tell() if hasattr(raw, "tell") else decoded
+        else:
+            response = self._session.get(url, headers=self.headers, params=params)
+            decoded = len(response.content)
+            wire = response.num_bytes_downloaded
+        elapsed = time.perf_counter() - start
+
+        with self._metrics_lock:
+            self._metrics["requests"] += 1
+            self._metrics["bytes"] += wire
+            self._metrics["decoded_bytes"] += decoded
+            self._metrics["seconds"] += elapsed
+
+        return response
+
+    def close(self):
+        """Close the shared connection used by the 'httpx' transport."""
+        if self._session is not None:
+            self._session.close()
 
     def test_connection(self) -> bool:
         """
@@ -41,9 +152,7 @@ class CanvasClient:
             Exception: If there's a connection error with details.
         """
         try:
-            response = requests.get(
-                f"{self.canvas_url}/api/v1/users/self", headers=self.headers
-            )
+            response = self.get(f"{self.canvas_url}/api/v1/users/self")
 
             if response.status_code == 200:
                 user_data = response.json()
@@ -58,5 +167,5 @@ class CanvasClient:
                     f"Connection failed with status {response.status_code}: {response.text}"
                 )
 
-        except requests.exceptions.RequestException as e:
+        except self._network_errors as e:
             raise Exception(f"Network error: {e}")
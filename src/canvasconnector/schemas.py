@@ -0,0 +1,152 @@
+"""Column types for the DataFrames returned by the package.
+
+Low-cardinality text columns use ``pl.Enum`` when Canvas's set of values is
+small and stable (grading types, enrollment types), and ``pl.Categorical``
+when it is open-ended (assignment workflow states, submission types, course
+and term names). IDs stay ``Int64`` because Canvas IDs do not fit in 32 bits,
+while positions and attempt counts use ``Int32``.
+
+If Canvas sends a value that isn't in an Enum, apply_schema() replaces it with
+``"unknown"`` and emits a warning naming the value, so a new Canvas value never
+drops a course or fails a call.
+
+Every course is cast to the same schema, so multi-course frames can be
+concatenated without ``how="diagonal"``.
+"""
+
+import warnings
+
+import polars as pl
+
+
+# Stand-in for values Canvas adds after these lists were written
+UNKNOWN_CATEGORY = "unknown"
+
+GRADING_TYPE = pl.Enum(
+    [
+        "pass_fail",
+        "percent",
+        "letter_grade",
+        "gpa_scale",
+        "points",
+        "not_graded",
+        UNKNOWN_CATEGORY,
+    ]
+)
+
+USER_TYPE = pl.Enum(
+    [
+        "StudentEnrollment",
+        "TeacherEnrollment",
+        "TaEnrollment",
+        "DesignerEnrollment",
+        "ObserverEnrollment",
+        "StudentViewEnrollment",
+        UNKNOWN_CATEGORY,
+    ]
+)
+
+ENROLLMENT_TYPE = pl.Enum(
+    ["student", "teacher", "ta", "observer", "designer", UNKNOWN_CATEGORY]
+)
+
+
+ASSIGNMENT_GROUPS_SCHEMA = {
+    "assignment_group_id": pl.Int64,
+    "assignment_group_name": pl.Categorical,
+    "assignment_group_weight": pl.Float64,
+    "assignment_group_position": pl.Int32,
+}
+
+
+def assignments_schema(timezone: str, assignment_weights: bool = False) -> dict:
+    """
+    Schema of the DataFrame returned by get_assignments().
+
+    Args:
+        timezone: IANA timezone string used for the datetime columns
+        assignment_weights: Whether the assignment group columns are included
+
+    Returns:
+        Dictionary mapping column names to Polars dtypes
+    """
+    schema = {
+        "workflow_state": pl.Categorical,
+        "course_id": pl.Int64,
+        "assignment_id": pl.Int64,
+        "assignment_name": pl.Utf8,
+        "position": pl.Int32,
+        "points_possible": pl.Float64,
+        "grading_type": GRADING_TYPE,
+        "created_at": pl.Datetime("us", timezone),
+        "due_at": pl.Datetime("us", timezone),
+        "omit_from_final_grade": pl.Boolean,
+        "assignment_group_id": pl.Int64,
+        "score": pl.Float64,
+        "grade": pl.Utf8,
+        "submission_type": pl.Categorical,
+        "submitted_at": pl.Datetime("us", timezone),
+        "excused": pl.Boolean,
+        "attempt": pl.Int32,
+        "late": pl.Boolean,
+        "missing": pl.Boolean,
+    }
+    if assignment_weights:
+        schema.update(ASSIGNMENT_GROUPS_SCHEMA)
+    return schema
+
+
+PEERS_SCHEMA = {
+    "course_id": pl.Int64,
+    "user_id": pl.Int64,
+    "user_name": pl.Utf8,
+    "user_date": pl.Date,
+    "user_type": USER_TYPE,
+}
+
+COURSES_SCHEMA = {
+    "course_id": pl.Int64,
+    "course_name": pl.Categorical,
+    "course_code": pl.Utf8,
+    "term_id": pl.Int64,
+    "term_name": pl.Categorical,
+    "term_start_at": pl.Date,
+    "term_end_at": pl.Date,
+    "enrollment_type": ENROLLMENT_TYPE,
+}
+
+
+def apply_schema(df: pl.DataFrame, schema: dict) -> pl.DataFrame:
+    """
+    Cast a DataFrame to a package schema and order its columns to match.
+
+    Values outside an Enum's categories are replaced with "unknown" and a
+    warning lists them, instead of failing the cast.
+
+    Args:
+        df: Polars DataFrame containing every column in the schema
+        schema: Dictionary mapping column names to Polars dtypes
+
+    Returns:
+        DataFrame with exactly the schema's columns and dtypes
+    """
+    df = df.select(list(schema))
+
+    for column, dtype in schema.items():
+        if not isinstance(dtype, pl.Enum):
+            continue
+        known = pl.col(column).cast(pl.Utf8).is_in(dtype.categories.to_list())
+        unknown = df.filter(pl.col(column).is_not_null() & ~known)[column].unique()
+        if len(unknown) > 0:
+            warnings.warn(
+                f"Unexpected {column} values {sorted(unknown.cast(pl.Utf8))} "
+                f"were replaced with '{UNKNOWN_CATEGORY}'."
+            )
+            df = df.with_columns(
+                pl.when(pl.col(column).is_null() | known)
+                .then(pl.col(column).cast(pl.Utf8))
+                .otherwise(pl.lit(UNKNOWN_CATEGORY))
+                .alias(column)
+            )
+
+    return df.cast(schema)
@@ -1,5 +1,15 @@
 # In a utils.py or in your functions
+import os
+import multiprocessing
 import polars as pl
+from typing import Optional
+from concurrent.futures import (
+    Executor,
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 
 
 def convert_canvas_datetime(
@@ -23,3 +33,221 @@ def convert_canvas_datetime(
         .dt.convert_time_zone(timezone)
         .alias(column)
     )
+
+
+def iter_course_results(
+    func, course_list, max_workers: int, max_in_flight: Optional[int] = None
+):
+    """
+    Run func(course_id) for each course in a thread pool and yield results as
+    they complete.
+
+    At most ``max_in_flight`` courses are submitted or waiting to be consumed
+    at any time, and each future is released once yielded, so the caller only
+    ever holds a bounded number of course results in memory.
+
+    Args:
+        func: Callable taking a course ID
+        course_list: Iterable of course IDs
+        max_workers: Number of worker threads
+        max_in_flight: Maximum number of outstanding courses
+            (default: 2 * max_workers)
+
+    Yields:
+        (course_id, future) tuples in completion order
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * max_workers
+    max_in_flight = max(max_in_flight, 1)
+
+    courses = iter(course_list)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        for course_id in courses:
+            pending[executor.submit(func, course_id)] = course_id
+            if len(pending) >= max_in_flight:
+                break
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                course_id = pending.pop(future)
+                yield course_id, future
+
+                # Top the window back up
+                next_course = next(courses, None)
+                if next_course is not None:
+                    pending[executor.submit(func, next_course)] = next_course
+
+
+def clear_course_partitions(sink: str, dataset: str) -> int:
+    """
+    Delete the Parquet files an earlier run wrote for a dataset in a sink.
+
+    Only ``{dataset}_*.parquet`` files are removed, so other datasets sharing
+    the directory and unrelated files are left alone.
+
+    Args:
+        sink: Sink directory (nothing happens if it doesn't exist)
+        dataset: Dataset prefix, e.g. "assignments" or "peers"
+
+    Returns:
+        Number of files removed
+    """
+    if not os.path.isdir(sink):
+        return 0
+
+    removed = 0
+    for name in os.listdir(sink):
+        if name.startswith(f"{dataset}_") and name.endswith(".parquet"):
+            os.remove(os.path.join(sink, name))
+            removed += 1
+    return removed
+
+
+def write_course_partition(df: pl.DataFrame, sink: str, dataset: str, course_id) -> str:
+    """
+    Write one course's DataFrame to a Parquet file inside a sink directory.
+
+    The file is written under a temporary name and moved into place, so a
+    reader scanning the sink never sees a half-written partition.
+
+    Args:
+        df: Polars DataFrame for a single course
+        sink: Directory to write to (created if missing)
+        dataset: Dataset prefix for the file name, e.g. "assignments"
+        course_id: Course ID used to name the file
+
+    Returns:
+        Path of the written file. Read a dataset back lazily with
+        ``pl.scan_parquet(f"{sink}/{dataset}_*.parquet")``.
+    """
+    os.makedirs(sink, exist_ok=True)
+    path = os.path.join(sink, f"{dataset}_{course_id}.parquet")
+    tmp_path = f"{path}.tmp"
+    df.write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def create_parse_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+        Create a process pool for the parse stage of the multi-course fetchers.
+
+        Starting worker processes means importing Polars in each one, so create
+        the pool once and pass it as ``parse_executor`` to every call instead of
+        letting each call start its own. The pool uses the "spawn" start method
+        (forking a process that already runs Polars' thread pool can deadlock),
+        so scripts using it need the usual ``if __name__ == "__main__":`` guard.
+
+        Args:
+            max_workers: Number of processes (default: os.cpu_count())
+
+        Returns:
+            A ProcessPoolExecutor; shut it down (or use it in a ``with`` block)
+            when you're done.
+
+        Example:
+    ```python
+            with create_parse_pool() as pool:
+                assignments = get_assignments_all_courses(
+                    client, courses["course_id"], max_workers=16, parse_executor=pool
+                )
+                peers = get_all_peers(client, courses["course_id"], parse_executor=pool)
+    ```
+    """
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def iter_parsed_results(
+    fetch,
+    parse,
+    course_list,
+    max_workers: int,
+    parse_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    parse_executor: Optional[Executor] = None,
+):
+    """
+    Two-stage version of iter_course_results: fetch(course_id) runs on I/O
+    threads and returns raw response bodies, parse(course_id, raw) turns them
+    into a DataFrame.
+
+    With ``parse_executor`` (see create_parse_pool()) or ``parse_workers``
+    set, parsing runs in a process pool so JSON decoding and frame
+    construction don't hold the GIL the I/O threads need. Parsed frames come
+    back through Polars' Arrow IPC pickling rather than as Python row dicts.
+    Without either, both stages run on the same thread. A pool started from
+    ``parse_workers`` only lives for this call; pass ``parse_executor`` to
+    reuse one across calls.
+
+    Args:
+        fetch: Callable taking a course ID and returning picklable raw data
+        parse: Picklable callable (a top-level function or functools.partial
+            of one) taking a course ID and the raw data
+        course_list: Iterable of course IDs
+        max_workers: Number of I/O threads
+        parse_workers: Number of parsing processes for a pool started just
+            for this call (default: None, no pool)
+        max_in_flight: Maximum number of outstanding courses per stage
+            (default: 2 * max_workers)
+        parse_executor: Existing executor to parse in. It is not shut down
+            (default: None)
+
+    Yields:
+        (course_id, future) tuples in completion order; future.result()
+        returns the parsed DataFrame or raises the fetch/parse error
+    """
+    if parse_executor is None and parse_workers is None:
+        yield from iter_course_results(
+            lambda course_id: parse(course_id, fetch(course_id)),
+            course_list,
+            max_workers,
+            max_in_flight,
+        )
+        return
+
+    if max_in_flight is None:
+        max_in_flight = 2 * max_workers
+    max_in_flight = max(max_in_flight, 1)
+
+    if parse_executor is not None:
+        yield from _parse_in(
+            parse_executor, fetch, parse, course_list, max_workers, max_in_flight
+        )
+        return
+
+    with create_parse_pool(parse_workers) as pool:
+        yield from _parse_in(
+            pool, fetch, parse, course_list, max_workers, max_in_flight
+        )
+
+
+def _parse_in(pool: Executor, fetch, parse, course_list, max_workers, max_in_flight):
+    parsing = {}
+
+    def drain(block: bool):
+        done, _ = wait(
+            parsing,
+            timeout=None if block else 0,
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            yield parsing.pop(future), future
+
+    for course_id, raw_future in iter_course_results(
+        fetch, course_list, max_workers, max_in_flight
+    ):
+        if raw_future.exception() is not None:
+            yield course_id, raw_future
+            continue
+
+        parsing[pool.submit(parse, course_id, raw_future.result())] = course_id
+        del raw_future
+
+        # Hand back finished frames early and keep the parse backlog bounded
+        yield from drain(block=len(parsing) >= max_in_flight)
+
+    while parsing:
+        yield from drain(block=True)
@@ -0,0 +1,409 @@
+from .make_client import CanvasClient
+from .get_assignments import get_assignments
+from .schemas import assignments_schema
+from .utils import iter_course_results
+
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+import polars as pl
+from typing import Iterator, Optional
+
+
+# Columns kept between polls. Everything else is dropped so the saved state
+# stays small no matter how much the assignment listing grows.
+WATCH_COLUMNS = [
+    "course_id",
+    "assignment_id",
+    "assignment_name",
+    "due_at",
+    "score",
+    "late",
+    "missing",
+]
+
+EVENT_SCHEMA = {
+    "event": pl.Utf8,
+    "course_id": pl.Int64,
+    "assignment_id": pl.Int64,
+    "assignment_name": pl.Utf8,
+    "old_value": pl.Utf8,
+    "new_value": pl.Utf8,
+}
+
+SUBMISSION_UPDATE_SCHEMA = {
+    "course_id": pl.Int64,
+    "assignment_id": pl.Int64,
+    "score": pl.Float64,
+    "late": pl.Boolean,
+    "missing": pl.Boolean,
+}
+
+CANVAS_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# How long after the due date to keep asking about an unscored assignment,
+# since Canvas sets the missing flag shortly after the deadline passes
+MISSING_GRACE = timedelta(days=1)
+
+# Subtracted from each check time before it's sent as graded_since or
+# submitted_since, so clock skew between this machine and Canvas can't hide a
+# grade; anything seen twice is merged on the assignment key
+CLOCK_OVERLAP = timedelta(minutes=1)
+
+_KEYS = ["course_id", "assignment_id"]
+
+
+def diff_assignments(previous: pl.DataFrame, current: pl.DataFrame) -> pl.DataFrame:
+    """Compare two assignment snapshots and return only what changed.
+
+        Args:
+            previous (pl.DataFrame): The earlier snapshot (from get_assignments_all_courses()).
+            current (pl.DataFrame): The newer snapshot.
+
+        Returns:
+            pl.DataFrame: One row per change event with columns:
+                - event (str): One of 'new_assignment', 'due_date_changed',
+                  'score_posted', 'late' or 'missing'
+                - course_id (int): The course ID
+                - assignment_id (int): The assignment ID
+                - assignment_name (str): Name of the assignment
+                - old_value (str): Value before the change (null for new items)
+                - new_value (str): Value after the change
+
+        Example:
+    ```python
+            before = get_assignments_all_courses(client, courses["course_id"])
+            after = get_assignments_all_courses(client, courses["course_id"])
+            print(diff_assignments(before, after))
+    ```
+    """
+    previous = previous.select(WATCH_COLUMNS)
+    current = current.select(WATCH_COLUMNS)
+
+    events = [
+        current.join(previous, on=_KEYS, how="anti").select(
+            pl.lit("new_assignment").alias("event"),
+            *_KEYS,
+            "assignment_name",
+            pl.lit(None, dtype=pl.Utf8).alias("old_value"),
+            pl.col("due_at").cast(pl.Utf8).alias("new_value"),
+        )
+    ]
+
+    joined = current.join(previous, on=_KEYS, how="inner", suffix="_prev")
+
+    def changed(event: str, condition: pl.Expr, column: str) -> pl.DataFrame:
+        return joined.filter(condition).select(
+            pl.lit(event).alias("event"),
+            *_KEYS,
+            "assignment_name",
+            pl.col(f"{column}_prev").cast(pl.Utf8).alias("old_value"),
+            pl.col(column).cast(pl.Utf8).alias("new_value"),
+        )
+
+    events.append(
+        changed(
+            "due_date_changed",
+            pl.col("due_at").ne_missing(pl.col("due_at_prev")),
+            "due_at",
+        )
+    )
+    events.append(
+        changed(
+            "score_posted",
+            pl.col("score").is_not_null()
+            & pl.col("score").ne_missing(pl.col("score_prev")),
+            "score",
+        )
+    )
+    # Only report the flags when they flip on
+    for flag in ["late", "missing"]:
+        events.append(
+            changed(
+                flag,
+                pl.col(flag).fill_null(False)
+                & ~pl.col(f"{flag}_prev").fill_null(False),
+                flag,
+            )
+        )
+
+    return pl.concat([e.cast(EVENT_SCHEMA) for e in events], how="vertical")
+
+
+def watch_assignments(
+    client: CanvasClient,
+    course_ids: pl.Series,
+    interval: int = 300,
+    state_path: Optional[str] = None,
+    max_polls: Optional[int] = None,
+    max_workers: int = 5,
+    full_refresh_every: Optional[int] = 12,
+) -> Iterator[pl.DataFrame]:
+    """Poll Canvas and yield only the assignment changes between polls.
+
+        The first time a course is seen its full assignment listing is fetched
+        as a baseline. After that, each poll only asks Canvas for what changed
+        since the course was last checked:
+
+        - the activity stream (one request for all courses) tells which courses
+          had assignment activity, and only those courses are fetched in full;
+        - every other course gets small submission queries filtered with
+          ``graded_since`` and ``submitted_since`` (scores posted, late work),
+          plus one for assignments that just passed their due date (missing).
+
+        The amount of data downloaded therefore follows the number of changes,
+        not the number of assignments. Every ``full_refresh_every`` polls all
+        courses are fetched in full to catch anything the signals missed.
+
+        A course that fails to load keeps its last known rows, and a course only
+        reports changes once it has been fetched successfully at least once, so
+        errors never show up as a burst of 'new_assignment' events.
+
+        Args:
+            client (CanvasClient): The Canvas API client instance.
+            course_ids (pl.Series): Course IDs to watch.
+            interval (int): Seconds to wait between polls (default: 300).
+            state_path (str, optional): Parquet file used to keep the last snapshot
+                on disk, so a restarted watcher picks up where it left off. If None
+                (default), state is only kept in memory.
+            max_polls (int, optional): Stop after this many polls. If None
+                (default), poll forever.
+            max_workers (int): Number of concurrent course fetches (default: 5).
+            full_refresh_every (int, optional): Fetch every course in full on
+                every n-th poll (default: 12). If None, only the first poll and
+                courses flagged by the activity stream are fetched in full.
+
+        Yields:
+            pl.DataFrame: The change events for a poll, in the format returned by
+                diff_assignments(). Polls without changes yield nothing.
+
+        Example:
+    ```python
+            courses = get_courses_polars(client, current_only=True)
+            for events in watch_assignments(client, courses["course_id"], interval=600):
+                print(events)
+    ```
+    """
+    course_ids = list(course_ids)
+    previous, checked = _load_state(state_path, client.timezone)
+
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        poll_started = (datetime.now(timezone.utc) - CLOCK_OVERLAP).strftime(
+            CANVAS_TIME_FORMAT
+        )
+        full_refresh = bool(full_refresh_every) and polls % full_refresh_every == (
+            full_refresh_every - 1
+        )
+        current, done = _poll(
+            client, course_ids, previous, checked, max_workers, full_refresh
+        )
+        polls += 1
+
+        # Courses seen for the first time only set a baseline; changes are
+        # reported for courses that were fetched successfully before
+        known = pl.col("course_id").is_in(list(checked))
+        events = diff_assignments(previous.filter(known), current.filter(known))
+        if not events.is_empty():
+            yield events
+
+        previous = current
+        checked.update({course_id: poll_started for course_id in done})
+        if state_path is not None:
+            _save_state(current, checked, state_path)
+
+        if max_polls is None or polls < max_polls:
+            time.sleep(interval)
+
+
+def _watch_schema(tz_name: str) -> dict:
+    schema = assignments_schema(tz_name)
+    return {column: schema[column] for column in WATCH_COLUMNS}
+
+
+def _poll(
+    client: CanvasClient,
+    course_ids: list,
+    previous: pl.DataFrame,
+    checked: dict,
+    max_workers: int,
+    full_refresh: bool,
+) -> tuple[pl.DataFrame, list]:
+    """Build the next snapshot, fetching full listings only where needed.
+
+    Courses that fail keep their rows from ``previous``, so a transient error
+    never turns into a burst of 'new_assignment' events on the next poll.
+
+    Returns:
+        tuple: (snapshot, list of course IDs checked successfully)
+    """
+    schema = _watch_schema(client.timezone)
+
+    refetch = {course_id for course_id in course_ids if course_id not in checked}
+    if full_refresh:
+        refetch = set(course_ids)
+    elif len(refetch) < len(course_ids):
+        since = {c: checked[c] for c in course_ids if c not in refetch}
+        active = _courses_with_activity(client, since)
+        refetch |= set(course_ids) if active is None else active
+
+    # Assignments that just passed their due date without a score; Canvas
+    # flags these as missing without touching graded_at or submitted_at
+    now = datetime.now(timezone.utc)
+    due_soon = (
+        previous.filter(
+            pl.col("due_at")
+            .dt.convert_time_zone("UTC")
+            .is_between(pl.lit(now - MISSING_GRACE), pl.lit(now))
+            & pl.col("score").is_null()
+            & ~pl.col("missing").fill_null(False)
+        )
+        .group_by("course_id")
+        .agg("assignment_id")
+    )
+    due_passed = dict(due_soon.iter_rows())
+    known_ids = dict(previous.group_by("course_id").agg("assignment_id").iter_rows())
+
+    def check(course_id):
+        if course_id not in refetch:
+            updates = _fetch_submission_updates(
+                client, course_id, checked[course_id], due_passed.get(course_id, [])
+            )
+            # A submission for an assignment we've never seen means the listing
+            # changed without an activity stream item, so fall back to a full fetch
+            if set(updates["assignment_id"]) <= set(known_ids.get(course_id, [])):
+                return False, updates
+        result = get_assignments(client, course_id)
+        if result.is_empty():
+            return True, pl.DataFrame(schema=schema)
+        return True, result.select(WATCH_COLUMNS).cast(schema)
+
+    frames = []
+    updates = []
+    replaced = []
+    done = []
+
+    for course_id, future in iter_course_results(check, course_ids, max_workers):
+        try:
+            full, result = future.result()
+            if full:
+                frames.append(result)
+                replaced.append(course_id)
+            else:
+                updates.append(result)
+            done.append(course_id)
+        except Exception as e:
+            print(f"Error fetching course {course_id}: {e}")
+
+    kept = previous.filter(
+        pl.col("course_id").is_in(course_ids) & ~pl.col("course_id").is_in(replaced)
+    )
+    if updates:
+        kept = kept.update(pl.concat(updates), on=_KEYS, how="left", include_nulls=True)
+    frames.append(kept.cast(schema))
+
+    return pl.concat(frames), done
+
+
+def _courses_with_activity(client: CanvasClient, since: dict) -> Optional[set]:
+    """Find courses with activity stream items newer than their last check.
+
+    Submission items are skipped because _fetch_submission_updates() covers
+    them; anything else (assignment notifications, announcements) marks the
+    course for a full refetch.
+
+    Returns:
+        set: Course IDs to refetch, or None if the stream couldn't be read far
+            enough back, in which case every course should be refetched.
+    """
+    url = f"{client.canvas_url}/api/v1/users/self/activity_stream"
+    params = {"per_page": 100}
+    oldest = min(since.values())
+    active = set()
+
+    while url:
+        response = client.get(url, params=params)
+        if response.status_code != 200:
+            return None
+
+        items = response.json()
+        for item in items:
+            course_id = item.get("course_id")
+            updated_at = item.get("updated_at") or ""
+            if (
+                item.get("type") != "Submission"
+                and course_id in since
+                and updated_at >= since[course_id]
+            ):
+                active.add(course_id)
+
+        # The stream is newest first, so stop once we're past the oldest check
+        if not items or min(item.get("updated_at") or "" for item in items) < oldest:
+            break
+
+        url = response.links.get("next", {}).get("url")
+        params = None
+
+    return active
+
+
+def _fetch_submission_updates(
+    client: CanvasClient, course_id: int, since: str, assignment_ids: list
+) -> pl.DataFrame:
+    """Get your submissions graded or submitted since ``since``, plus the ones
+    for ``assignment_ids``, as rows to update the snapshot with.
+    """
+    url = f"{client.canvas_url}/api/v1/courses/{course_id}/students/submissions"
+    filters = [[("graded_since", since)], [("submitted_since", since)]]
+    if assignment_ids:
+        filters.append([("assignment_ids[]", a) for a in assignment_ids])
+
+    submissions = {}
+    for extra in filters:
+        next_url = url
+        params = [("student_ids[]", "self"), ("per_page", 100), *extra]
+        while next_url:
+            response = client.get(next_url, params=params)
+            if response.status_code != 200:
+                raise Exception(
+                    f"API request failed with status {response.status_code}: {response.text}"
+                )
+            for submission in response.json():
+                submissions[submission["assignment_id"]] = submission
+
+            next_url = response.links.get("next", {}).get("url")
+            params = None
+
+    return pl.DataFrame(
+        {
+            "course_id": [course_id] * len(submissions),
+            "assignment_id": list(submissions),
+            "score": [s.get("score") for s in submissions.values()],
+            "late": [s.get("late") for s in submissions.values()],
+            "missing": [s.get("missing") for s in submissions.values()],
+        },
+        schema=SUBMISSION_UPDATE_SCHEMA,
+    )
+
+
+def _load_state(state_path: Optional[str], tz_name: str) -> tuple[pl.DataFrame, dict]:
+    """Read the saved snapshot and the per-course check times, if any."""
+    if state_path is None or not os.path.exists(state_path):
+        return pl.DataFrame(schema=_watch_schema(tz_name)), {}
+
+    metadata = pl.read_parquet_metadata(state_path)
+    checked = json.loads(metadata.get("canvasconnector.checked_at", "{}"))
+    state = pl.read_parquet(state_path).cast(_watch_schema(tz_name))
+    return state, {int(course_id): at for course_id, at in checked.items()}
+
+
+def _save_state(state: pl.DataFrame, checked: dict, state_path: str):
+    # Write next to the target and swap it in, so a crash mid-write never
+    # leaves a truncated state file behind
+    tmp_path = f"{state_path}.tmp"
+    state.write_parquet(
+        tmp_path,
+        metadata={"canvasconnector.checked_at": json.dumps(checked)},
+    )
+    os.replace(tmp_path, state_path)
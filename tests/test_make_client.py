@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pytest
+
+from canvasconnector import CanvasClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from mock_canvas import MockCanvas, serve  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def mock_url():
+    server, url = serve(MockCanvas(n_courses=2, n_assignments=25))
+    yield url
+    server.shutdown()
+
+
+def test_unknown_transport_raises():
+    with pytest.raises(ValueError, match="bogus"):
+        CanvasClient(
+            "token", "https://canvas.test", verify_connection=False, transport="bogus"
+        )
+
+
+@pytest.mark.parametrize("missing", ["httpx", "h2"])
+def test_httpx_transport_without_extras_shows_install_hint(monkeypatch, missing):
+    if missing == "h2":
+        pytest.importorskip("httpx")
+    # A None entry makes the import fail as if the package weren't installed
+    monkeypatch.setitem(sys.modules, missing, None)
+
+    with pytest.raises(ImportError, match=r"canvasconnector\[http2\]"):
+        CanvasClient(
+            "token", "https://canvas.test", verify_connection=False, transport="httpx"
+        )
+
+
+@pytest.mark.parametrize("transport", ["requests", "httpx"])
+def test_metrics_count_wire_and_decoded_bytes(mock_url, transport):
+    if transport == "httpx":
+        pytest.importorskip("h2")
+    client = CanvasClient(
+        "token", mock_url, verify_connection=False, transport=transport
+    )
+    client.headers["Accept-Encoding"] = "gzip"
+
+    responses = [
+        client.get(f"{mock_url}/api/v1/courses/1000/assignments", params={"page": page})
+        for page in [1, 2, 3]
+    ]
+    metrics = client.metrics
+    client.close()
+
+    assert all(r.headers["Content-Encoding"] == "gzip" for r in responses)
+    assert metrics["requests"] == 3
+    assert metrics["bytes"] == sum(int(r.headers["Content-Length"]) for r in responses)
+    assert metrics["decoded_bytes"] == sum(len(r.content) for r in responses)
+    # The assignment descriptions are repetitive, so gzip shrinks them a lot
+    assert metrics["bytes"] * 5 < metrics["decoded_bytes"]
+    assert metrics["seconds"] > 0
+
+
+def test_reset_metrics(mock_url):
+    client = CanvasClient("token", mock_url, verify_connection=True)
+    assert client.metrics["requests"] == 1
+
+    snapshot = client.metrics
+    snapshot["requests"] = 100
+    assert client.metrics["requests"] == 1
+
+    client.reset_metrics()
+
+    assert client.metrics == {
+        "requests": 0,
+        "bytes": 0,
+        "decoded_bytes": 0,
+        "seconds": 0.0,
+    }
+    client.get(f"{mock_url}/api/v1/users/self")
+    assert client.metrics["requests"] == 1
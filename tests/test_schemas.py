@@ -0,0 +1,99 @@
+import json
+
+import polars as pl
+import pytest
+
+from canvasconnector.get_assignments import _parse_assignments
+from canvasconnector.schemas import (
+    PEERS_SCHEMA,
+    USER_TYPE,
+    apply_schema,
+    assignments_schema,
+)
+
+
+def peers_frame(user_types):
+    return pl.DataFrame(
+        {
+            "course_id": [1] * len(user_types),
+            "user_id": list(range(len(user_types))),
+            "user_name": [f"User {i}" for i in range(len(user_types))],
+            "user_date": [None] * len(user_types),
+            "user_type": user_types,
+        }
+    )
+
+
+def test_apply_schema_casts_known_values():
+    df = apply_schema(peers_frame(["StudentEnrollment", None]), PEERS_SCHEMA)
+
+    assert df.schema["user_type"] == USER_TYPE
+    assert df["user_type"].to_list() == ["StudentEnrollment", None]
+
+
+def test_apply_schema_maps_unknown_enum_values_with_warning():
+    with pytest.warns(UserWarning, match="AuditorEnrollment"):
+        df = apply_schema(
+            peers_frame(["StudentEnrollment", "AuditorEnrollment"]), PEERS_SCHEMA
+        )
+
+    assert df["user_type"].to_list() == ["StudentEnrollment", "unknown"]
+
+
+def assignment(course_id, submission):
+    return {
+        "id": course_id * 100,
+        "workflow_state": "published",
+        "course_id": course_id,
+        "name": "Essay",
+        "position": 1,
+        "points_possible": 10,
+        "grading_type": "points",
+        "created_at": "2026-01-01T00:00:00Z",
+        "due_at": None,
+        "omit_from_final_grade": False,
+        "assignment_group_id": 7,
+        "submission": submission,
+    }
+
+
+def test_courses_with_different_null_patterns_concat_without_diagonal():
+    empty = {
+        "score": None,
+        "grade": None,
+        "submission_type": None,
+        "submitted_at": None,
+        "excused": None,
+        "attempt": None,
+        "late": None,
+        "missing": None,
+    }
+    graded = {
+        "score": 9.5,
+        "grade": "9.5",
+        "submission_type": "online_upload",
+        "submitted_at": "2026-01-30T00:00:00Z",
+        "excused": False,
+        "attempt": 2,
+        "late": True,
+        "missing": False,
+    }
+    groups = json.dumps(
+        [{"id": 7, "name": "Homework", "group_weight": 40, "position": 1}]
+    ).encode()
+
+    for weights in [None, groups]:
+        frames = [
+            _parse_assignments(
+                course_id,
+                ([json.dumps([assignment(course_id, submission)]).encode()], weights),
+                "America/Denver",
+            )
+            for course_id, submission in [(1, empty), (2, graded)]
+        ]
+
+        expected = assignments_schema("America/Denver", weights is not None)
+        assert frames[0].schema == frames[1].schema
+        assert list(frames[0].schema) == list(expected)
+        assert all(frames[0].schema[c] == dtype for c, dtype in expected.items())
+        assert len(pl.concat(frames, how="vertical")) == 2
@@ -0,0 +1,247 @@
+import importlib
+import json
+import threading
+import time
+import tracemalloc
+
+import polars as pl
+import pytest
+
+from canvasconnector import (
+    CanvasClient,
+    create_parse_pool,
+    get_all_peers,
+    get_assignments_all_courses,
+)
+
+# The package re-exports functions with the same names as their modules
+assignments_module = importlib.import_module("canvasconnector.get_assignments")
+peers_module = importlib.import_module("canvasconnector.get_peers")
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.status_code = 200
+        self.content = json.dumps(data).encode()
+        self.text = self.content.decode()
+        self.headers = {}
+        self.links = {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def fake_assignments(course_id):
+    return [
+        {
+            "id": course_id * 100 + i,
+            "workflow_state": "published",
+            "course_id": course_id,
+            "name": f"Assignment {i}",
+            "position": i,
+            "points_possible": 10,
+            "grading_type": "points",
+            "created_at": "2026-01-01T00:00:00Z",
+            "due_at": "2026-02-01T00:00:00Z",
+            "omit_from_final_grade": False,
+            "assignment_group_id": 7,
+            "submission": {
+                "score": 8.0,
+                "grade": "8",
+                "submission_type": "online_upload",
+                "submitted_at": "2026-01-30T00:00:00Z",
+                "excused": False,
+                "attempt": 1,
+                "late": False,
+                "missing": False,
+            },
+        }
+        for i in range(20)
+    ]
+
+
+class LiveCounter:
+    """Counts courses that have started downloading but aren't written yet."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.live = 0
+        self.peak = 0
+
+    def started(self):
+        with self.lock:
+            self.live += 1
+            self.peak = max(self.peak, self.live)
+
+    def finished(self):
+        with self.lock:
+            self.live -= 1
+
+
+@pytest.fixture
+def client():
+    return CanvasClient("token", "https://canvas.test", verify_connection=False)
+
+
+def instrument(monkeypatch, client, module):
+    counter = LiveCounter()
+
+    def fake_get(url, params=None):
+        time.sleep(0.001)
+        course_id = int(url.split("/courses/")[1].split("/")[0])
+        if url.endswith("/assignments"):
+            counter.started()
+            return FakeResponse(fake_assignments(course_id))
+        if url.endswith("/assignment_groups"):
+            return FakeResponse(
+                [{"id": 7, "name": "Homework", "group_weight": 40, "position": 1}]
+            )
+        if url.endswith("/users"):
+            counter.started()
+            return FakeResponse(
+                [
+                    {
+                        "id": course_id * 10 + u,
+                        "name": f"Student {u}",
+                        "created_at": "2020-01-01T00:00:00-07:00",
+                        "enrollments": [{"type": "StudentEnrollment"}],
+                    }
+                    for u in range(5)
+                ]
+            )
+        raise AssertionError(f"unexpected url {url}")
+
+    write = module.write_course_partition
+
+    def counting_write(df, sink, dataset, course_id):
+        path = write(df, sink, dataset, course_id)
+        counter.finished()
+        return path
+
+    monkeypatch.setattr(client, "get", fake_get)
+    monkeypatch.setattr(module, "write_course_partition", counting_write)
+    return counter
+
+
+@pytest.mark.parametrize("n_courses", [10, 50, 200])
+def test_assignments_sink_memory_stays_flat(monkeypatch, tmp_path, client, n_courses):
+    counter = instrument(monkeypatch, client, assignments_module)
+
+    result = get_assignments_all_courses(
+        client,
+        pl.Series(range(1, n_courses + 1)),
+        max_workers=4,
+        sink=str(tmp_path),
+        return_frame=False,
+        max_in_flight=6,
+    )
+
+    assert result.is_empty()
+    assert counter.peak <= 6
+    assert len(list(tmp_path.glob("assignments_*.parquet"))) == n_courses
+    written = (
+        pl.scan_parquet(f"{tmp_path}/assignments_*.parquet").select(pl.len()).collect()
+    )
+    assert written.item() == n_courses * 20
+
+
+@pytest.mark.parametrize("n_courses", [10, 50, 200])
+def test_peers_sink_memory_stays_flat(monkeypatch, tmp_path, client, n_courses):
+    counter = instrument(monkeypatch, client, peers_module)
+
+    get_all_peers(
+        client,
+        pl.Series(range(1, n_courses + 1)),
+        max_workers=4,
+        sink=str(tmp_path),
+        return_frame=False,
+        max_in_flight=6,
+    )
+
+    assert counter.peak <= 6
+    assert len(list(tmp_path.glob("peers_*.parquet"))) == n_courses
+
+
+def test_sink_peak_memory_does_not_grow_with_course_count(
+    monkeypatch, tmp_path, client
+):
+    instrument(monkeypatch, client, assignments_module)
+
+    peaks = {}
+    for n_courses in [10, 50, 200]:
+        tracemalloc.start()
+        try:
+            get_assignments_all_courses(
+                client,
+                pl.Series(range(1, n_courses + 1)),
+                max_workers=4,
+                sink=str(tmp_path / str(n_courses)),
+                return_frame=False,
+                max_in_flight=6,
+            )
+            _, peaks[n_courses] = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    # 20x the courses may cost some bookkeeping, but nothing close to 20x
+    assert peaks[200] < 1.5 * peaks[10], peaks
+
+
+def test_assignments_and_peers_share_a_sink(monkeypatch, tmp_path, client):
+    instrument(monkeypatch, client, assignments_module)
+    instrument(monkeypatch, client, peers_module)
+    sink = str(tmp_path)
+    (tmp_path / "notes.parquet").write_bytes(b"not ours")
+
+    kwargs = {"sink": sink, "return_frame": False, "max_in_flight": 6}
+    get_assignments_all_courses(client, pl.Series(range(1, 11)), **kwargs)
+    get_all_peers(client, pl.Series(range(1, 11)), **kwargs)
+    # A smaller rerun replaces the earlier run's files instead of mixing in
+    get_assignments_all_courses(client, pl.Series(range(1, 4)), **kwargs)
+
+    assignments = pl.scan_parquet(f"{sink}/assignments_*.parquet").collect()
+    peers = pl.scan_parquet(f"{sink}/peers_*.parquet").collect()
+
+    assert sorted(assignments["course_id"].unique()) == [1, 2, 3]
+    assert len(peers) == 10 * 5
+    assert (tmp_path / "notes.parquet").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_return_frame_without_sink_raises(client):
+    with pytest.raises(ValueError):
+        get_assignments_all_courses(client, pl.Series([1]), return_frame=False)
+    with pytest.raises(ValueError):
+        get_all_peers(client, pl.Series([1]), return_frame=False)
+
+
+@pytest.fixture(scope="module")
+def parse_pool():
+    with create_parse_pool(2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize("pool_kwarg", ["parse_workers", "parse_executor"])
+def test_parse_pool_matches_single_stage(monkeypatch, client, parse_pool, pool_kwarg):
+    instrument(monkeypatch, client, assignments_module)
+    fake_get = client.get
+
+    def flaky_get(url, params=None):
+        if "/courses/3/" in url:
+            raise ConnectionError("connection reset")
+        return fake_get(url, params)
+
+    monkeypatch.setattr(client, "get", flaky_get)
+    courses = pl.Series(range(1, 9))
+    pool = {"parse_workers": 2, "parse_executor": parse_pool}[pool_kwarg]
+
+    for fetch_all, keys in [
+        (get_assignments_all_courses, ["course_id", "assignment_id"]),
+        (get_all_peers, ["course_id", "user_id"]),
+    ]:
+        single = fetch_all(client, courses, max_workers=4).sort(keys)
+        two_stage = fetch_all(client, courses, max_workers=4, **{pool_kwarg: pool})
+
+        assert 3 not in single["course_id"]
+        assert single["course_id"].n_unique() == 7
+        assert two_stage.sort(keys).equals(single)
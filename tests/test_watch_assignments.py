@@ -0,0 +1,241 @@
+import importlib
+import json
+from datetime import datetime, timezone
+
+import polars as pl
+import pytest
+import requests
+
+from canvasconnector import CanvasClient, diff_assignments, watch_assignments
+
+# The package re-exports functions with the same names as their modules
+watch_module = importlib.import_module("canvasconnector.watch_assignments")
+
+
+def snapshot(rows):
+    """Build a WATCH_COLUMNS frame from (assignment_id, due day, score, late, missing)."""
+    return pl.DataFrame(
+        {
+            "course_id": [1] * len(rows),
+            "assignment_id": [r[0] for r in rows],
+            "assignment_name": [f"Assignment {r[0]}" for r in rows],
+            "due_at": [datetime(2026, 2, r[1], tzinfo=timezone.utc) for r in rows],
+            "score": [r[2] for r in rows],
+            "late": [r[3] for r in rows],
+            "missing": [r[4] for r in rows],
+        },
+        schema=watch_module._watch_schema("UTC"),
+    )
+
+
+def events_by_type(events):
+    return {
+        (row["event"], row["assignment_id"]): (row["old_value"], row["new_value"])
+        for row in events.iter_rows(named=True)
+    }
+
+
+def test_diff_assignments_reports_each_change_once():
+    previous = snapshot(
+        [
+            (1, 1, None, False, False),  # unchanged
+            (2, 1, None, False, False),  # due date moves
+            (3, 1, None, False, False),  # first score
+            (4, 1, 7.0, False, False),  # regrade
+            (5, 1, 8.0, True, False),  # still late
+            (6, 1, None, False, True),  # missing cleared
+        ]
+    )
+    current = snapshot(
+        [
+            (1, 1, None, False, False),
+            (2, 3, None, False, False),
+            (3, 1, 9.0, True, False),
+            (4, 1, 8.5, False, False),
+            (5, 1, 8.0, True, False),
+            (6, 1, None, False, False),
+            (7, 5, None, False, True),  # new
+        ]
+    )
+
+    events = events_by_type(diff_assignments(previous, current))
+
+    assert events == {
+        ("new_assignment", 7): (None, "2026-02-05 00:00:00.000000+00:00"),
+        ("due_date_changed", 2): (
+            "2026-02-01 00:00:00.000000+00:00",
+            "2026-02-03 00:00:00.000000+00:00",
+        ),
+        ("score_posted", 3): (None, "9.0"),
+        ("score_posted", 4): ("7.0", "8.5"),
+        ("late", 3): ("false", "true"),
+    }
+
+
+def test_diff_assignments_without_changes_is_empty():
+    df = snapshot([(1, 1, 8.0, True, True)])
+
+    events = diff_assignments(df, df)
+
+    assert events.is_empty()
+    assert events.schema == pl.Schema(watch_module.EVENT_SCHEMA)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.status_code = 200
+        self.content = json.dumps(data).encode()
+        self.text = self.content.decode()
+        self.headers = {}
+        self.links = {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeCanvas:
+    """Serves assignment listings for client.get, with switchable failures."""
+
+    def __init__(self, course_ids):
+        self.assignments = {
+            course_id: [self.assignment(course_id, i) for i in range(3)]
+            for course_id in course_ids
+        }
+        self.failing = set()
+
+    @staticmethod
+    def assignment(course_id, i, score=None):
+        return {
+            "id": course_id * 100 + i,
+            "workflow_state": "published",
+            "course_id": course_id,
+            "name": f"Assignment {i}",
+            "position": i,
+            "points_possible": 10,
+            "grading_type": "points",
+            "created_at": "2026-01-01T00:00:00Z",
+            "due_at": "2026-02-01T00:00:00Z",
+            "omit_from_final_grade": False,
+            "assignment_group_id": 7,
+            "submission": {
+                "score": score,
+                "grade": None if score is None else str(score),
+                "submission_type": None,
+                "submitted_at": None,
+                "excused": False,
+                "attempt": None,
+                "late": False,
+                "missing": False,
+            },
+        }
+
+    def get(self, url, params=None):
+        course_id = int(url.split("/courses/")[1].split("/")[0])
+        if course_id in self.failing:
+            raise requests.exceptions.ConnectionError("connection reset")
+        return FakeResponse(self.assignments[course_id])
+
+
+@pytest.fixture
+def canvas(monkeypatch):
+    canvas = FakeCanvas([1, 2])
+    client = CanvasClient("token", "https://canvas.test", verify_connection=False)
+    monkeypatch.setattr(client, "get", canvas.get)
+    return client, canvas
+
+
+def poll(client, **kwargs):
+    # full_refresh_every=1 fetches every course in full on each poll, so the
+    # mocked client only has to serve assignment listings
+    return list(
+        watch_assignments(
+            client,
+            pl.Series([1, 2]),
+            interval=0,
+            max_polls=1,
+            full_refresh_every=1,
+            **kwargs,
+        )
+    )
+
+
+def test_failing_course_keeps_its_rows(canvas, capsys):
+    client, fake = canvas
+    previous = pl.DataFrame(schema=watch_module._watch_schema(client.timezone))
+
+    # Baseline for both courses, then course 2 fails while course 1 gets a
+    # new assignment
+    current, done = watch_module._poll(client, [1, 2], previous, {}, 5, True)
+    assert sorted(done) == [1, 2]
+    checked = {1: "2026-01-01T00:00:00Z", 2: "2026-01-01T00:00:00Z"}
+
+    fake.failing.add(2)
+    fake.assignments[1].append(fake.assignment(1, 3))
+    after_failure, done = watch_module._poll(client, [1, 2], current, checked, 5, True)
+
+    assert done == [1]
+    assert "Error fetching course 2" in capsys.readouterr().out
+    assert (
+        after_failure.filter(pl.col("course_id") == 2)
+        .sort("assignment_id")
+        .equals(current.filter(pl.col("course_id") == 2).sort("assignment_id"))
+    )
+
+    # Once course 2 is back, only the real change in course 1 is reported
+    fake.failing.clear()
+    recovered, _ = watch_module._poll(client, [1, 2], after_failure, checked, 5, True)
+    events = diff_assignments(current, after_failure).vstack(
+        diff_assignments(after_failure, recovered)
+    )
+
+    assert events["event"].to_list() == ["new_assignment"]
+    assert events["assignment_id"].to_list() == [103]
+
+
+def test_watch_reports_no_new_assignments_after_a_failed_poll(canvas, tmp_path):
+    client, fake = canvas
+    state_path = str(tmp_path / "state.parquet")
+
+    fake.failing.add(2)
+    assert poll(client, state_path=state_path) == []
+
+    # Course 2's first successful fetch only sets its baseline
+    fake.failing.clear()
+    assert poll(client, state_path=state_path) == []
+
+    fake.failing.add(2)
+    assert poll(client, state_path=state_path) == []
+
+    fake.failing.clear()
+    fake.assignments[2][0] = fake.assignment(2, 0, score=9.0)
+    events = poll(client, state_path=state_path)
+
+    assert len(events) == 1
+    assert events[0]["event"].to_list() == ["score_posted"]
+    assert events[0]["course_id"].to_list() == [2]
+
+
+def test_state_round_trip_keeps_checked_at(canvas, tmp_path):
+    client, _ = canvas
+    state_path = str(tmp_path / "state.parquet")
+
+    poll(client, state_path=state_path)
+    state, checked = watch_module._load_state(state_path, client.timezone)
+
+    assert sorted(checked) == [1, 2]
+    assert all(isinstance(course_id, int) for course_id in checked)
+    # Check times are stored a little early to absorb clock skew
+    now = datetime.now(timezone.utc)
+    for at in checked.values():
+        stored = datetime.strptime(at, watch_module.CANVAS_TIME_FORMAT)
+        lag = now - stored.replace(tzinfo=timezone.utc)
+        assert watch_module.CLOCK_OVERLAP <= lag < 2 * watch_module.CLOCK_OVERLAP
+    assert len(state) == 6
+    assert state.schema == pl.Schema(watch_module._watch_schema(client.timezone))
+
+    watch_module._save_state(state, checked, state_path)
+    reloaded, reloaded_checked = watch_module._load_state(state_path, client.timezone)
+
+    assert reloaded.equals(state)
+    assert reloaded_checked == checked
+    assert not (tmp_path / "state.parquet.tmp").exists()